@@ -0,0 +1,124 @@
+# Накладные расходы логирования на один запрос при росте конкурентности:
+# синхронный StreamHandler (как было) vs очередь + фоновый writer.
+# Оба варианта делают одинаковые вызовы логирования, как пайплайн STT → LLM → TTS
+# (включая выборочное логирование вопроса через log_verbose), а между ними поток
+# запроса блокируется на "upstream" (sleep), как настоящий поток запроса на I/O.
+# Замеряется wall-время только самих вызовов логирования.
+#   python bench_logging.py
+
+import os
+import time
+import queue
+import random
+import logging
+import tempfile
+import threading
+import statistics
+from time import perf_counter
+from logging.handlers import QueueListener
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("SHARED_CACHE_ROOT", "")
+
+from main import (
+    DeferredQueueHandler, RequestIdFilter, request_id_var, log_sampled_var, log_verbose,
+    LOG_SAMPLE_RATE,
+)
+
+REQUESTS_PER_THREAD = 40
+THREADS = [1, 4, 16, 64]
+# STT, LLM, TTS — время ожидания upstream между группами вызовов логирования
+UPSTREAM_SECONDS = (0.005, 0.02, 0.01)
+QUESTION = "Какие перчатки и респираторы у вас есть? " * 5
+FORMAT = "%(asctime)s | %(levelname)s | %(request_id)s | %(message)s"
+
+def sync_logger(stream) -> tuple[logging.Logger, None]:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(FORMAT))
+    handler.addFilter(RequestIdFilter())
+    log = logging.getLogger("bench.sync")
+    log.handlers = [handler]
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    return log, None
+
+def queued_logger(stream) -> tuple[logging.Logger, QueueListener]:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(FORMAT))
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    log = logging.getLogger("bench.queued")
+    log.handlers = [queue_handler]
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return log, listener
+
+def request(log: logging.Logger) -> float:
+    # те же вызовы, что в transcribe_file / generate_answer / synthesize_speech / build_answer
+    stt, llm, tts = UPSTREAM_SECONDS
+    spent = 0.0
+
+    time.sleep(stt)
+    started = perf_counter()
+    log.info("STT done: chars=%d", len(QUESTION))
+    log.info("LLM start: lang=%s, question_chars=%d", "ru", len(QUESTION))
+    question_sample = log_verbose(QUESTION)
+    if question_sample is not None:
+        log.info("LLM question: %r", question_sample)
+    spent += perf_counter() - started
+
+    time.sleep(llm)
+    started = perf_counter()
+    log.info("LLM done: answer_chars=%d, truncated=%s", 1200, False)
+    log.info("TTS start: voice=%s, lang=%s, chars=%d", "nova", "ru", 300)
+    spent += perf_counter() - started
+
+    time.sleep(tts)
+    started = perf_counter()
+    log.info(
+        "Shaped answer: lang=%s, channel=%s, text_chars=%d, truncated=%s, "
+        "spoken_chars=%d, audio_bytes=%d, latency_ms=%.0f",
+        "ru", "voice", 1200, False, 300, 48000, 35.0,
+    )
+    spent += perf_counter() - started
+
+    return spent
+
+def run(log: logging.Logger, threads: int) -> tuple[float, float]:
+    timings = []
+    lock = threading.Lock()
+
+    def worker(n: int):
+        local = []
+        for i in range(REQUESTS_PER_THREAD):
+            request_id_var.set(f"bench-{n}-{i}")
+            log_sampled_var.set(random.random() < LOG_SAMPLE_RATE)
+            local.append(request(log))
+        with lock:
+            timings.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[18]
+
+def main():
+    with tempfile.TemporaryFile("w") as stream:
+        for name, setup in (("sync", sync_logger), ("queued", queued_logger)):
+            log, listener = setup(stream)
+            for threads in THREADS:
+                p50, p95 = run(log, threads)
+                print(
+                    f"{name:7} threads={threads:3} logging per request "
+                    f"p50={p50 * 1e6:7.1f}us  p95={p95 * 1e6:8.1f}us"
+                )
+            if listener is not None:
+                listener.stop()
+
+if __name__ == "__main__":
+    main()
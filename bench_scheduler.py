@@ -0,0 +1,105 @@
+# Бенчмарк изоляции: interactive /voice при насыщении upstream bulk-трафиком на /ask.
+# Запросы идут через HTTP-роуты приложения (ASGI, с threadpool Starlette),
+# вызовы OpenAI заменены на sleep, сеть не нужна.
+#   python bench_scheduler.py
+
+import os
+import time
+import asyncio
+import statistics
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("SHARED_CACHE_ROOT", "")
+
+import httpx
+
+import main
+from main import PriorityScheduler, INTERACTIVE, BULK
+
+UPSTREAM_SECONDS = 0.05
+TOTAL_SLOTS = 8
+# больше, чем 40 потоков threadpool Starlette по умолчанию
+BULK_CLIENTS = 64
+INTERACTIVE_CLIENTS = 4
+INTERACTIVE_REQUESTS = 25
+
+def fake_generate_answer(
+    question: str, max_tokens: int | None = None
+) -> tuple[str, str, bool]:
+    time.sleep(UPSTREAM_SECONDS)
+    return "Ответ.", "ru", False
+
+def fake_synthesize_speech(text: str, lang: str) -> bytes:
+    return b"audio"
+
+def fake_transcribe_file(path: str) -> str:
+    return "Какие перчатки у вас есть?"
+
+async def run(scheduler: PriorityScheduler, fifo: bool) -> tuple[float, float, int]:
+    main.scheduler = scheduler
+    if fifo:
+        main.resolve_priority = lambda header, default: "all"
+
+    stop = asyncio.Event()
+    bulk_done = 0
+    latencies = []
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as http:
+
+        async def bulk_client():
+            nonlocal bulk_done
+            while not stop.is_set():
+                response = await http.post("/ask", json={"question": "bulk"})
+                response.raise_for_status()
+                bulk_done += 1
+
+        async def interactive_client():
+            for _ in range(INTERACTIVE_REQUESTS):
+                started = time.perf_counter()
+                response = await http.post("/voice", files={"file": ("q.webm", b"voice")})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(UPSTREAM_SECONDS)
+
+        bulk = [asyncio.create_task(bulk_client()) for _ in range(BULK_CLIENTS)]
+        await asyncio.sleep(0.5)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(interactive_client() for _ in range(INTERACTIVE_CLIENTS)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await asyncio.gather(*bulk)
+
+    p50 = statistics.median(latencies)
+    p95 = statistics.quantiles(latencies, n=20)[18]
+    return p50, p95, int(bulk_done / (elapsed + 0.5))
+
+def main_bench():
+    main.generate_answer = fake_generate_answer
+    main.synthesize_speech = fake_synthesize_speech
+    main.transcribe_file = fake_transcribe_file
+    resolve_priority = main.resolve_priority
+
+    scenarios = {
+        # одна общая очередь — как было без планировщика
+        "fifo": (PriorityScheduler(TOTAL_SLOTS, {"all": (1, TOTAL_SLOTS)}), True),
+        "priority (4:1, bulk<=4)": (
+            PriorityScheduler(
+                TOTAL_SLOTS, {INTERACTIVE: (4, TOTAL_SLOTS), BULK: (1, TOTAL_SLOTS // 2)}
+            ),
+            False,
+        ),
+    }
+
+    for name, (scheduler, fifo) in scenarios.items():
+        main.resolve_priority = resolve_priority
+        p50, p95, bulk_rps = asyncio.run(run(scheduler, fifo))
+        print(
+            f"{name:26} interactive p50={p50 * 1000:6.1f}ms "
+            f"p95={p95 * 1000:6.1f}ms  bulk≈{bulk_rps} req/s"
+        )
+
+if __name__ == "__main__":
+    main_bench()
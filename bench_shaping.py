@@ -0,0 +1,77 @@
+# Сравнение: озвучка полного ответа vs короткой устной версии, по языкам.
+#   python bench_shaping.py            — настоящий OpenAI API (нужен OPENAI_API_KEY):
+#                                        байты аудио и end-to-end latency
+#   python bench_shaping.py --offline  — без сети: длинные ответы-каталоги берутся из
+#                                        SYSTEM_PROMPTS, байты аудио оцениваются по длине
+#                                        озвучиваемого текста
+
+import os
+import sys
+import time
+
+OFFLINE = "--offline" in sys.argv
+if OFFLINE:
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("SHARED_CACHE_ROOT", "")
+
+from main import (
+    generate_answer, make_spoken_summary, synthesize_speech, MAX_TOKENS, VOICE,
+    SYSTEM_PROMPTS,
+)
+
+QUESTIONS = {
+    "ru": "Какие перчатки и респираторы у вас есть?",
+    "kk": "Сіздер кімсіздер және сайтта қандай бөлімдер бар?",
+    "en": "What gloves and respirators do you have?",
+}
+
+# разделы промптов, которые модель пересказывает списком на такие вопросы
+OFFLINE_ANSWERS = {
+    "ru": ("Ассортимент:", "===="),
+    "kk": ("1) КОМПАНИЯ ТУРАЛЫ", "4) ЖАУАП БЕРУ"),
+    "en": ("Assortment:", "===="),
+}
+
+# mp3 gpt-4o-mini-tts: оценка ~14 символов речи в секунду, ~8 КБ на секунду звука
+CHARS_PER_SECOND = 14
+MP3_BYTES_PER_SECOND = 8000
+
+def measure(question: str, shaped: bool) -> tuple[int, float]:
+    started = time.perf_counter()
+    answer, lang, _ = generate_answer(question, MAX_TOKENS[VOICE] if shaped else None)
+    spoken = make_spoken_summary(answer, lang) if shaped else answer
+    audio_bytes = synthesize_speech(spoken, lang)
+    return len(audio_bytes), time.perf_counter() - started
+
+def offline_answer(lang: str) -> str:
+    start, end = OFFLINE_ANSWERS[lang]
+    prompt = SYSTEM_PROMPTS[lang]
+    begin = prompt.index(start)
+    return prompt[begin:prompt.index(end, begin + len(start))].strip()
+
+def estimate_audio_bytes(text: str) -> int:
+    return int(len(text) / CHARS_PER_SECOND * MP3_BYTES_PER_SECOND)
+
+def main():
+    for lang, question in QUESTIONS.items():
+        if OFFLINE:
+            full = offline_answer(lang)
+            spoken = make_spoken_summary(full, lang)
+            full_bytes, shaped_bytes = estimate_audio_bytes(full), estimate_audio_bytes(spoken)
+            print(
+                f"{lang}: spoken chars {len(full)} -> {len(spoken)}, "
+                f"audio ≈{full_bytes} -> ≈{shaped_bytes} bytes "
+                f"({1 - shaped_bytes / full_bytes:.0%} less)"
+            )
+            continue
+
+        full_bytes, full_seconds = measure(question, shaped=False)
+        shaped_bytes, shaped_seconds = measure(question, shaped=True)
+        print(
+            f"{lang}: audio {full_bytes} -> {shaped_bytes} bytes "
+            f"({1 - shaped_bytes / full_bytes:.0%} less), "
+            f"latency {full_seconds:.2f}s -> {shaped_seconds:.2f}s"
+        )
+
+if __name__ == "__main__":
+    main()
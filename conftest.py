@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# main читает окружение при импорте — задаём его один раз для всех тестов
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["SHARED_CACHE_ROOT"] = tempfile.mkdtemp(prefix="armger-test-")
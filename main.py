@@ -1,22 +1,72 @@
 import os
 import re
+import json
+import time
+import shutil
+import hashlib
+import uuid
+import queue
+import atexit
+import random
 import base64
+import asyncio
 import tempfile
 import logging
+import contextvars
+from logging.handlers import QueueHandler, QueueListener
+from collections import deque
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from openai import OpenAI
 
 # ================== LOGGING ==================
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
-)
+# Запись в stderr идёт в фоновом потоке через очередь: поток запроса только кладёт
+# record в очередь. Форматирование (%-аргументы) тоже выполняется в фоне.
+
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+LOG_VERBOSE_MAX_CHARS = 200
+
+request_id_var = contextvars.ContextVar("request_id", default="-")
+log_sampled_var = contextvars.ContextVar("log_sampled", default=False)
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class DeferredQueueHandler(QueueHandler):
+    # стандартный prepare() форматирует сообщение в потоке запроса — откладываем до listener
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+log_queue = queue.SimpleQueue()
+
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter(
+    "%(asctime)s | %(levelname)s | %(request_id)s | %(message)s"
+))
+
+queue_handler = DeferredQueueHandler(log_queue)
+queue_handler.addFilter(RequestIdFilter())
+
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 logger = logging.getLogger(__name__)
 
+log_listener = QueueListener(log_queue, log_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+def log_verbose(value: str) -> str | None:
+    # подробные поля (текст вопроса) пишем только для выборки запросов
+    if not log_sampled_var.get():
+        return None
+    return value[:LOG_VERBOSE_MAX_CHARS]
+
 # ================== OPENAI ==================
 
 if not os.getenv("OPENAI_API_KEY"):
@@ -37,6 +87,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_context(request, call_next):
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex[:12]
+    request_id_var.set(request_id)
+    log_sampled_var.set(random.random() < LOG_SAMPLE_RATE)
+
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # ================== SCHEMA ==================
 
 class AskRequest(BaseModel):
@@ -679,7 +739,20 @@ Sheets/napkins:
 
 # ================== GPT ==================
 
-def generate_answer(question: str) -> tuple[str, str]:
+def trim_truncated(answer: str) -> str:
+    # ответ упёрся в max_tokens: убираем оборванный на полуслове пункт или предложение
+    # границу строки или предложения берём, только если она оставляет хотя бы половину текста
+    half = len(answer) // 2
+    cut = answer.rfind("\n")
+    if cut < half:
+        cut = max(answer.rfind(". "), answer.rfind("! "), answer.rfind("? ")) + 1
+    if cut < half:
+        cut = answer.rfind(" ")
+    if cut > 0:
+        answer = answer[:cut].rstrip(" ,;:")
+    return answer + " …"
+
+def generate_answer(question: str, max_tokens: int | None = None) -> tuple[str, str, bool]:
     lang = detect_lang(question)
 
     if lang not in SYSTEM_PROMPTS:
@@ -687,8 +760,10 @@ def generate_answer(question: str) -> tuple[str, str]:
 
     system_prompt = SYSTEM_PROMPTS[lang]
 
-    logger.info(f"Detected language: {lang}")
-    logger.info(f"Question: {question}")
+    logger.info("LLM start: lang=%s, question_chars=%d", lang, len(question))
+    question_sample = log_verbose(question)
+    if question_sample is not None:
+        logger.info("LLM question: %r", question_sample)
 
     completion = client.chat.completions.create(
         model="gpt-4o-mini",
@@ -696,19 +771,68 @@ def generate_answer(question: str) -> tuple[str, str]:
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": question}
         ],
-        temperature=0.2
+        temperature=0.2,
+        max_tokens=max_tokens
+    )
+
+    choice = completion.choices[0]
+    answer = choice.message.content.strip()
+    truncated = choice.finish_reason == "length"
+    if truncated:
+        answer = trim_truncated(answer)
+    logger.info("LLM done: answer_chars=%d, truncated=%s", len(answer), truncated)
+
+    return answer, lang, truncated
+
+# ================== RESPONSE SHAPING ==================
+# Полный текст уходит на экран, в TTS — только короткая устная версия.
+
+VOICE = "voice"
+TEXT = "text"
+
+MAX_TOKENS = {
+    VOICE: int(os.getenv("VOICE_MAX_TOKENS", "350")),
+    TEXT: int(os.getenv("TEXT_MAX_TOKENS", "800")),
+}
+SPOKEN_MAX_CHARS = int(os.getenv("SPOKEN_MAX_CHARS", "300"))
+
+SPOKEN_TAIL = {
+    "ru": "Подробности — в тексте ответа.",
+    "kk": "Толығырақ — жауап мәтінінде.",
+    "en": "See the full answer in the text.",
+}
+
+def make_spoken_summary(answer: str, lang: str) -> str:
+    # списки и разметку не зачитываем: маркеры убираем, строки склеиваем
+    # цифра — маркер списка, только если за ней пробел: "1.500 ₸" — это цена, а не пункт
+    lines = [
+        re.sub(r"[*_#`]+", "", re.sub(r"^\s*(?:[-*•#]+|\d+[.)](?=\s))\s*", "", line)).strip()
+        for line in answer.splitlines()
+    ]
+    # пункт без точки в конце — добавляем её, чтобы TTS делал паузу между пунктами
+    text = " ".join(
+        line if line[-1] in ".!?:;,…" else line + "."
+        for line in lines if line
     )
 
-    answer = completion.choices[0].message.content.strip()
-    logger.info(f"Answer length: {len(answer)}")
+    if len(text) <= SPOKEN_MAX_CHARS:
+        return text
+
+    # режем по концу предложения, только если он оставляет хотя бы половину лимита
+    head = text[:SPOKEN_MAX_CHARS]
+    cut = max(head.rfind(". "), head.rfind("! "), head.rfind("? "))
+    if cut >= SPOKEN_MAX_CHARS // 2:
+        head = head[:cut + 1]
+    else:
+        head = head.rsplit(" ", 1)[0].rstrip(",;:") + "…"
 
-    return answer, lang
+    return f"{head} {SPOKEN_TAIL.get(lang, SPOKEN_TAIL['ru'])}"
 
 # ================== TTS ==================
 
-def speak_text(text: str, lang: str) -> str:
+def synthesize_speech(text: str, lang: str) -> bytes:
     voice = select_voice(lang)
-    logger.info(f"TTS voice={voice}, lang={lang}")
+    logger.info("TTS start: voice=%s, lang=%s, chars=%d", voice, lang, len(text))
 
     response = client.audio.speech.create(
         model="gpt-4o-mini-tts",
@@ -716,8 +840,391 @@ def speak_text(text: str, lang: str) -> str:
         input=text
     )
 
-    audio_bytes = response.read()
-    return base64.b64encode(audio_bytes).decode("utf-8")
+    return response.read()
+
+# ================== SHARED CACHE ==================
+# Общий кэш ответов для всех uvicorn-воркеров на ноде: файлы в /dev/shm (tmpfs).
+# Каталог привязан к версии SYSTEM_PROMPTS — при смене промптов старый кэш удаляется.
+# Одна запись = один файл (метаданные JSON-строкой + аудио), записывается атомарно.
+
+PROMPTS_VERSION = hashlib.sha256(
+    json.dumps(SYSTEM_PROMPTS, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+PROMPTS_VERSION_RE = re.compile(r"[0-9a-f]{12}")
+
+SHARED_CACHE_ROOT = os.getenv(
+    "SHARED_CACHE_ROOT",
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+)
+SHARED_CACHE_MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "500"))
+# обход каталога для вытеснения — раз в SHARED_CACHE_EVICT_EVERY записей воркера;
+# вытесняем до 90% лимита, чтобы следующая запись снова не упиралась в него
+SHARED_CACHE_EVICT_EVERY = 50
+cache_writes = 0
+# свой подкаталог приложения: в SHARED_CACHE_ROOT могут лежать чужие файлы
+SHARED_CACHE_APP_DIR = (
+    os.path.join(SHARED_CACHE_ROOT, "armger-cache") if SHARED_CACHE_ROOT else ""
+)
+SHARED_CACHE_DIR = (
+    os.path.join(SHARED_CACHE_APP_DIR, PROMPTS_VERSION) if SHARED_CACHE_APP_DIR else ""
+)
+
+def init_shared_cache():
+    if not SHARED_CACHE_DIR:
+        return
+
+    try:
+        os.makedirs(SHARED_CACHE_DIR, exist_ok=True)
+        for name in os.listdir(SHARED_CACHE_APP_DIR):
+            if name != PROMPTS_VERSION and PROMPTS_VERSION_RE.fullmatch(name):
+                shutil.rmtree(os.path.join(SHARED_CACHE_APP_DIR, name), ignore_errors=True)
+        logger.info("Shared cache: %s", SHARED_CACHE_DIR)
+    except OSError:
+        logger.warning("Shared cache disabled", exc_info=True)
+
+def cache_key(question: str, channel: str) -> str:
+    normalized = channel + ":" + " ".join(question.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def write_shared_file(path: str, data: bytes):
+    # запись во временный файл + os.replace: другие воркеры не увидят файл наполовину
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def cache_get(question: str, channel: str) -> dict | None:
+    if not SHARED_CACHE_DIR:
+        return None
+
+    path = os.path.join(SHARED_CACHE_DIR, cache_key(question, channel) + ".entry")
+    try:
+        with open(path, "rb") as f:
+            meta = json.loads(f.readline())
+            audio = base64.b64encode(f.read()).decode("utf-8")
+        # mtime = время последнего использования: частые ответы не вытесняются первыми
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Shared cache read failed", exc_info=True)
+        return None
+
+    return {**meta, "audio": audio}
+
+def cache_put(question: str, channel: str, meta: dict, audio_bytes: bytes):
+    global cache_writes
+    if not SHARED_CACHE_DIR:
+        return
+
+    path = os.path.join(SHARED_CACHE_DIR, cache_key(question, channel) + ".entry")
+    # json.dumps экранирует переводы строк — первая строка файла целиком метаданные
+    data = json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n" + audio_bytes
+    cache_writes += 1
+    try:
+        if cache_writes % SHARED_CACHE_EVICT_EVERY == 0:
+            evict_cache()
+        write_shared_file(path, data)
+    except OSError:
+        logger.warning("Shared cache write failed", exc_info=True)
+
+def evict_cache():
+    entries = []
+    for entry in os.scandir(SHARED_CACHE_DIR):
+        if entry.name.endswith(".entry"):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+
+    if len(entries) <= SHARED_CACHE_MAX_ENTRIES:
+        return
+
+    # самые давно не использованные — первыми
+    entries.sort()
+    for _, path in entries[:len(entries) - SHARED_CACHE_MAX_ENTRIES * 9 // 10]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+init_shared_cache()
+
+# ================== SCHEDULER ==================
+# Приоритеты: interactive (/voice) и bulk (/ask, генерация контента, тесты).
+# Weighted fair queuing между классами + лимит одновременных вызовов OpenAI на класс.
+# Слот ждём в event loop (asyncio), а в threadpool уходим только с полученным слотом:
+# bulk-запросы в очереди не занимают потоки Starlette и не блокируют interactive.
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+class PriorityScheduler:
+    def __init__(self, total_slots: int, classes: dict[str, tuple[int, int]]):
+        # classes: имя -> (вес, максимум одновременных слотов)
+        self.total_slots = total_slots
+        self.weights = {name: weight for name, (weight, _) in classes.items()}
+        self.caps = {name: cap for name, (_, cap) in classes.items()}
+        self.waiting = {name: deque() for name in classes}
+        self.active = {name: 0 for name in classes}
+        self.vtime = {name: 0.0 for name in classes}
+        self.global_vtime = 0.0
+        self.total_active = 0
+
+    def dispatch(self):
+        while self.total_active < self.total_slots:
+            ready = [
+                name for name, waiting in self.waiting.items()
+                if waiting and self.active[name] < self.caps[name]
+            ]
+            if not ready:
+                return
+
+            name = min(ready, key=lambda n: self.vtime[n])
+            future = self.waiting[name].popleft()
+            if future.done():
+                # ожидавший запрос отменён (клиент отключился)
+                continue
+
+            self.active[name] += 1
+            self.total_active += 1
+            self.global_vtime = self.vtime[name]
+            self.vtime[name] += 1 / self.weights[name]
+            future.set_result(None)
+
+    async def acquire(self, name: str):
+        future = asyncio.get_running_loop().create_future()
+        if not self.waiting[name]:
+            # простаивавший класс не должен накапливать "кредит" и вытеснять остальных
+            self.vtime[name] = max(self.vtime[name], self.global_vtime)
+        self.waiting[name].append(future)
+        self.dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # слот выдан, но задачу успели отменить — возвращаем его
+                self.release(name)
+            raise
+
+    def release(self, name: str):
+        self.active[name] -= 1
+        self.total_active -= 1
+        self.dispatch()
+
+    @asynccontextmanager
+    async def slot(self, name: str):
+        await self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+scheduler = PriorityScheduler(
+    total_slots=int(os.getenv("UPSTREAM_CONCURRENCY", "8")),
+    classes={
+        INTERACTIVE: (
+            int(os.getenv("INTERACTIVE_WEIGHT", "4")),
+            int(os.getenv("INTERACTIVE_CONCURRENCY", "8")),
+        ),
+        BULK: (
+            int(os.getenv("BULK_WEIGHT", "1")),
+            int(os.getenv("BULK_CONCURRENCY", "4")),
+        ),
+    },
+)
+
+def resolve_priority(header: str | None, default: str) -> str:
+    if header and header.lower() in (INTERACTIVE, BULK):
+        return header.lower()
+    return default
+
+# ================== PIPELINE ==================
+# Блокирующие вызовы OpenAI выполняются в threadpool, только внутри слота планировщика.
+
+def transcribe_file(path: str) -> str:
+    with open(path, "rb") as f:
+        transcript = client.audio.transcriptions.create(
+            model="gpt-4o-transcribe",
+            file=f
+        )
+    logger.info("STT done: chars=%d", len(transcript.text))
+    return transcript.text
+
+def build_answer(question: str, channel: str) -> dict:
+    started = time.perf_counter()
+    answer, lang, truncated = generate_answer(question, MAX_TOKENS[channel])
+    spoken = make_spoken_summary(answer, lang)
+    audio_bytes = synthesize_speech(spoken, lang)
+
+    logger.info(
+        "Shaped answer: lang=%s, channel=%s, text_chars=%d, truncated=%s, "
+        "spoken_chars=%d, audio_bytes=%d, latency_ms=%.0f",
+        lang, channel, len(answer), truncated, len(spoken), len(audio_bytes),
+        (time.perf_counter() - started) * 1000,
+    )
+
+    meta = {"text": answer, "truncated": truncated}
+    cache_put(question, channel, meta, audio_bytes)
+    return {**meta, "audio": base64.b64encode(audio_bytes).decode("utf-8")}
+
+async def answer_question(question: str, priority: str = BULK, channel: str = TEXT) -> dict:
+    cached = await run_in_threadpool(cache_get, question, channel)
+    if cached is not None:
+        logger.info("Shared cache hit")
+        return cached
+
+    async with scheduler.slot(priority):
+        return await run_in_threadpool(build_answer, question, channel)
+
+async def answer_voice_file(path: str, priority: str = INTERACTIVE) -> dict:
+    try:
+        async with scheduler.slot(priority):
+            question = await run_in_threadpool(transcribe_file, path)
+        return await answer_question(question, priority, VOICE)
+    finally:
+        os.remove(path)
+
+def save_upload(content: bytes) -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
+        tmp.write(content)
+        return tmp.name
+
+# ================== JOBS ==================
+# Долгие запросы: POST сразу возвращает job_id, результат забирается через GET /jobs/{id}.
+# Задача — asyncio task: пока ждёт слот планировщика, поток не занимает.
+# Файловые операции с записями задач — в threadpool, как и чтение кэша.
+# Состояние и результат задачи лежат в общем каталоге ноды (как и кэш), поэтому
+# опрос может прийти в любой uvicorn-воркер, а не только в тот, что принял POST.
+# Незавершённая запись хранит pid воркера; пока задача жива, воркер обновляет mtime файла
+# (heartbeat). Если воркер упал или перезапущен, опрос получает status=error.
+
+JOBS_DIR = os.getenv(
+    "JOBS_DIR",
+    os.path.join(SHARED_CACHE_ROOT or tempfile.gettempdir(), "armger-jobs")
+)
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "100"))
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "600"))
+JOB_MAX_WAIT_SECONDS = 30
+JOB_POLL_SECONDS = 0.2
+JOB_PURGE_SECONDS = 30
+JOB_HEARTBEAT_SECONDS = 5
+JOB_STALE_SECONDS = 30
+JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+os.makedirs(JOBS_DIR, exist_ok=True)
+
+# задачи этого воркера: держим ссылки на task и ограничиваем очередь
+running_jobs: dict[str, asyncio.Task] = {}
+heartbeat_task: asyncio.Task | None = None
+last_purge = 0.0
+
+def job_path(job_id: str) -> str:
+    return os.path.join(JOBS_DIR, job_id + ".json")
+
+def write_job(job_id: str, record: dict):
+    write_shared_file(job_path(job_id), json.dumps(record, ensure_ascii=False).encode("utf-8"))
+
+def pending_record(status: str) -> dict:
+    return {"status": status, "pid": os.getpid(), "started": time.time()}
+
+def worker_alive(pid: int) -> bool:
+    # JOBS_DIR локален для ноды, поэтому pid из записи — процесс этой же машины
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def read_job(job_id: str) -> dict | None:
+    if not JOB_ID_RE.fullmatch(job_id):
+        return None
+
+    try:
+        with open(job_path(job_id), "rb") as f:
+            heartbeat = os.fstat(f.fileno()).st_mtime
+            record = json.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+    if record["status"] in ("queued", "running"):
+        pid = record.get("pid")
+        if time.time() - heartbeat > JOB_STALE_SECONDS or (pid and not worker_alive(pid)):
+            return {"status": "error", "detail": "Job lost: worker stopped"}
+
+    return record
+
+def touch_jobs(job_ids: list[str]):
+    for job_id in job_ids:
+        try:
+            os.utime(job_path(job_id))
+        except FileNotFoundError:
+            pass
+
+async def heartbeat_jobs():
+    while running_jobs:
+        await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+        await run_in_threadpool(touch_jobs, list(running_jobs))
+
+def purge_jobs():
+    # TTL считается от последнего обновления записи (mtime файла)
+    deadline = time.time() - JOB_TTL_SECONDS
+    for entry in os.scandir(JOBS_DIR):
+        try:
+            if entry.stat().st_mtime < deadline:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+async def run_job(job_id: str, fn, *args):
+    await run_in_threadpool(write_job, job_id, pending_record("running"))
+
+    try:
+        result = await fn(*args)
+        record = {"status": "done", **result}
+    except Exception as e:
+        logger.exception("JOB ERROR")
+        record = {"status": "error", "detail": str(e)}
+
+    await run_in_threadpool(write_job, job_id, record)
+
+async def submit_job(fn, *args) -> str:
+    global last_purge, heartbeat_task
+    # полный обход JOBS_DIR — не чаще раза в JOB_PURGE_SECONDS на воркер
+    if time.monotonic() - last_purge > JOB_PURGE_SECONDS:
+        last_purge = time.monotonic()
+        await run_in_threadpool(purge_jobs)
+
+    if len(running_jobs) >= JOB_QUEUE_LIMIT:
+        raise HTTPException(status_code=503, detail="Job queue is full")
+
+    job_id = uuid.uuid4().hex
+    await run_in_threadpool(write_job, job_id, pending_record("queued"))
+
+    # create_task копирует контекст — request_id запроса попадёт и в логи задачи
+    task = asyncio.create_task(run_job(job_id, fn, *args))
+    running_jobs[job_id] = task
+    task.add_done_callback(lambda _: running_jobs.pop(job_id, None))
+
+    if heartbeat_task is None or heartbeat_task.done():
+        heartbeat_task = asyncio.create_task(heartbeat_jobs())
+
+    return job_id
+
+async def job_view(job_id: str) -> dict:
+    record = await run_in_threadpool(read_job, job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {"job_id": job_id, **record}
 
 # ================== ROUTES ==================
 
@@ -726,39 +1233,53 @@ def root():
     return {"status": "ok"}
 
 @app.post("/ask")
-def ask(data: AskRequest):
+async def ask(data: AskRequest, x_priority: str | None = Header(None)):
     if not data.question.strip():
         raise HTTPException(status_code=400, detail="Empty question")
 
     try:
-        answer, lang = generate_answer(data.question)
-        audio = speak_text(answer, lang)
-        return {"text": answer, "audio": audio}
+        return await answer_question(data.question, resolve_priority(x_priority, BULK))
 
     except Exception as e:
         logger.exception("ASK ERROR")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/voice")
-async def voice(file: UploadFile = File(...)):
+async def voice(file: UploadFile = File(...), x_priority: str | None = Header(None)):
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        with open(tmp_path, "rb") as f:
-            transcript = client.audio.transcriptions.create(
-                model="gpt-4o-transcribe",
-                file=f
-            )
-
-        question = transcript.text
-        answer, lang = generate_answer(question)
-        audio = speak_text(answer, lang)
-
-        return {"text": answer, "audio": audio}
+        tmp_path = save_upload(await file.read())
+        return await answer_voice_file(tmp_path, resolve_priority(x_priority, INTERACTIVE))
 
     except Exception as e:
         logger.exception("VOICE ERROR")
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/ask/jobs", status_code=202)
+async def ask_job(data: AskRequest, x_priority: str | None = Header(None)):
+    if not data.question.strip():
+        raise HTTPException(status_code=400, detail="Empty question")
+
+    priority = resolve_priority(x_priority, BULK)
+    return {"job_id": await submit_job(answer_question, data.question, priority)}
+
+@app.post("/voice/jobs", status_code=202)
+async def voice_job(file: UploadFile = File(...), x_priority: str | None = Header(None)):
+    tmp_path = save_upload(await file.read())
+    try:
+        priority = resolve_priority(x_priority, INTERACTIVE)
+        return {"job_id": await submit_job(answer_voice_file, tmp_path, priority)}
+    except HTTPException:
+        os.remove(tmp_path)
+        raise
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0):
+    # wait > 0 — long-polling: ждём результат не дольше wait секунд, не занимая поток
+    deadline = time.monotonic() + min(wait, JOB_MAX_WAIT_SECONDS)
+    view = await job_view(job_id)
+
+    while view["status"] in ("queued", "running") and time.monotonic() < deadline:
+        await asyncio.sleep(JOB_POLL_SECONDS)
+        view = await job_view(job_id)
+
+    return view
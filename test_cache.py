@@ -0,0 +1,46 @@
+import os
+
+import main
+
+def use_cache_dir(monkeypatch, tmp_path):
+    app_dir = tmp_path / "armger-cache"
+    cache_dir = app_dir / main.PROMPTS_VERSION
+    monkeypatch.setattr(main, "SHARED_CACHE_APP_DIR", str(app_dir))
+    monkeypatch.setattr(main, "SHARED_CACHE_DIR", str(cache_dir))
+    return app_dir, cache_dir
+
+def age(path, seconds: float):
+    stamp = os.path.getmtime(path) - seconds
+    os.utime(path, (stamp, stamp))
+
+def test_init_removes_only_old_prompt_versions(monkeypatch, tmp_path):
+    app_dir, cache_dir = use_cache_dir(monkeypatch, tmp_path)
+    (app_dir / "0123456789ab").mkdir(parents=True)
+    (app_dir / "notes").mkdir()
+    (tmp_path / "important_data").mkdir()
+
+    main.init_shared_cache()
+
+    assert sorted(os.listdir(app_dir)) == sorted([main.PROMPTS_VERSION, "notes"])
+    assert (tmp_path / "important_data").is_dir()
+    assert cache_dir.is_dir()
+
+def test_eviction_keeps_recently_read_entries(monkeypatch, tmp_path):
+    _, cache_dir = use_cache_dir(monkeypatch, tmp_path)
+    cache_dir.mkdir(parents=True)
+    monkeypatch.setattr(main, "SHARED_CACHE_MAX_ENTRIES", 10)
+
+    for i in range(11):
+        main.cache_put(f"вопрос {i}", "text", {"text": str(i)}, b"audio")
+        age(cache_dir / (main.cache_key(f"вопрос {i}", "text") + ".entry"), 100 - i)
+
+    # самый старый по записи, но его только что прочитали
+    assert main.cache_get("вопрос 0", "text")["text"] == "0"
+
+    main.evict_cache()
+
+    assert len(os.listdir(cache_dir)) == 9
+    assert main.cache_get("вопрос 0", "text") is not None
+    assert main.cache_get("вопрос 1", "text") is None
+    assert main.cache_get("вопрос 2", "text") is None
+    assert main.cache_get("вопрос 10", "text") is not None
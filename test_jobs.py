@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import subprocess
+
+from fastapi.testclient import TestClient
+
+import main
+
+# второй uvicorn-воркер: отдельный процесс с тем же SHARED_CACHE_ROOT
+OTHER_WORKER = """
+import sys, json
+from fastapi.testclient import TestClient
+import main
+response = TestClient(main.app).get("/jobs/" + sys.argv[1])
+print(json.dumps({"code": response.status_code, "body": response.json()}))
+"""
+
+def fake_generate_answer(
+    question: str, max_tokens: int | None = None
+) -> tuple[str, str, bool]:
+    return "Ответ: " + question, "ru", False
+
+def fake_synthesize_speech(text: str, lang: str) -> bytes:
+    return b"audio"
+
+def poll_from_other_worker(job_id: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", OTHER_WORKER, job_id],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=os.environ.copy(),
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def test_job_result_is_visible_from_another_worker(monkeypatch):
+    monkeypatch.setattr(main, "generate_answer", fake_generate_answer)
+    monkeypatch.setattr(main, "synthesize_speech", fake_synthesize_speech)
+
+    with TestClient(main.app) as http:
+        response = http.post("/ask/jobs", json={"question": "перчатки"})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        assert http.get(f"/jobs/{job_id}", params={"wait": 5}).json()["status"] == "done"
+
+    other = poll_from_other_worker(job_id)
+    assert other["code"] == 200
+    assert other["body"]["status"] == "done"
+    assert other["body"]["text"] == "Ответ: перчатки"
+    assert other["body"]["audio"] == "YXVkaW8="
+
+def test_unknown_or_malformed_job_id_is_404():
+    with TestClient(main.app) as http:
+        assert http.get("/jobs/" + "0" * 32).status_code == 404
+        assert http.get("/jobs/..%2Fetc%2Fpasswd").status_code == 404
+
+def test_expired_jobs_are_purged():
+    job_id = "f" * 32
+    main.write_job(job_id, {"status": "done", "text": "old"})
+    expired = os.path.getmtime(main.job_path(job_id)) - main.JOB_TTL_SECONDS - 1
+    os.utime(main.job_path(job_id), (expired, expired))
+
+    main.purge_jobs()
+
+    assert main.read_job(job_id) is None
+
+def test_job_of_a_dead_worker_is_reported_as_error():
+    dead = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    job_id = "a" * 32
+    main.write_job(job_id, {**main.pending_record("running"), "pid": int(dead.stdout)})
+
+    record = main.read_job(job_id)
+
+    assert record["status"] == "error"
+
+def test_job_without_heartbeat_is_reported_as_error():
+    job_id = "b" * 32
+    main.write_job(job_id, main.pending_record("running"))
+    assert main.read_job(job_id)["status"] == "running"
+
+    stale = os.path.getmtime(main.job_path(job_id)) - main.JOB_STALE_SECONDS - 1
+    os.utime(main.job_path(job_id), (stale, stale))
+
+    assert main.read_job(job_id)["status"] == "error"
+
+def test_heartbeat_keeps_running_job_fresh():
+    job_id = "c" * 32
+    main.write_job(job_id, main.pending_record("running"))
+    stale = os.path.getmtime(main.job_path(job_id)) - main.JOB_STALE_SECONDS - 1
+    os.utime(main.job_path(job_id), (stale, stale))
+
+    main.touch_jobs([job_id])
+
+    assert main.read_job(job_id)["status"] == "running"
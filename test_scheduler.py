@@ -0,0 +1,95 @@
+import asyncio
+
+from main import PriorityScheduler
+
+async def grant_order(scheduler: PriorityScheduler, holder: str, waiters: list[str]) -> list[str]:
+    # держим единственный слот, ставим ожидающих в очередь, затем отпускаем по одному
+    order = []
+
+    async def waiter(name: str):
+        async with scheduler.slot(name):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await scheduler.acquire(holder)
+    tasks = [asyncio.create_task(waiter(name)) for name in waiters]
+    await asyncio.sleep(0)
+    scheduler.release(holder)
+    await asyncio.gather(*tasks)
+    return order
+
+def test_classes_are_served_in_proportion_to_weights():
+    async def scenario():
+        scheduler = PriorityScheduler(1, {"interactive": (3, 1), "bulk": (1, 1)})
+        waiters = ["interactive"] * 6 + ["bulk"] * 6
+        return await grant_order(scheduler, "interactive", waiters)
+
+    order = asyncio.run(scenario())
+
+    assert order[:8].count("interactive") == 6
+    assert order[:8].count("bulk") == 2
+
+def test_idle_class_does_not_burst_ahead_after_returning():
+    async def scenario():
+        scheduler = PriorityScheduler(1, {"a": (1, 1), "b": (1, 1)})
+        for _ in range(10):
+            async with scheduler.slot("a"):
+                pass
+        return await grant_order(scheduler, "a", ["a", "a", "a", "b", "b", "b"])
+
+    order = asyncio.run(scenario())
+
+    # без сброса виртуального времени b получил бы все три слота подряд
+    assert order != ["b", "b", "b", "a", "a", "a"]
+    assert order[:2].count("b") == 1
+
+def test_per_class_and_total_caps():
+    async def scenario():
+        scheduler = PriorityScheduler(3, {"a": (1, 1), "b": (1, 5)})
+        tasks = [asyncio.create_task(scheduler.acquire("a")) for _ in range(3)]
+        tasks += [asyncio.create_task(scheduler.acquire("b")) for _ in range(5)]
+        await asyncio.sleep(0)
+
+        state = dict(scheduler.active), scheduler.total_active
+        for task in tasks:
+            task.cancel()
+        return state
+
+    active, total = asyncio.run(scenario())
+
+    assert active == {"a": 1, "b": 2}
+    assert total == 3
+
+def test_cancelled_waiter_is_skipped():
+    async def scenario():
+        scheduler = PriorityScheduler(1, {"a": (1, 1)})
+        await scheduler.acquire("a")
+        cancelled = asyncio.create_task(scheduler.acquire("a"))
+        next_waiter = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        scheduler.release("a")
+        await next_waiter
+        return scheduler.active["a"], scheduler.total_active, cancelled.cancelled()
+
+    assert asyncio.run(scenario()) == (1, 1, True)
+
+def test_slot_granted_to_cancelled_task_is_returned():
+    async def scenario():
+        scheduler = PriorityScheduler(1, {"a": (1, 1)})
+        await scheduler.acquire("a")
+        waiter = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+
+        # слот выдан (future уже с результатом), но задача отменена до возобновления
+        scheduler.release("a")
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        state = scheduler.active["a"], scheduler.total_active
+        await asyncio.wait_for(scheduler.acquire("a"), timeout=1)
+        return state, waiter.cancelled()
+
+    assert asyncio.run(scenario()) == ((0, 0), True)
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import main
+
+def fake_completion(content: str, finish_reason: str):
+    choice = SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)
+    return SimpleNamespace(choices=[choice])
+
+def patch_completion(monkeypatch, content: str, finish_reason: str):
+    create = lambda **kwargs: fake_completion(content, finish_reason)
+    monkeypatch.setattr(main.client.chat.completions, "create", create)
+
+def test_truncated_answer_is_marked_and_trimmed_to_whole_item(monkeypatch):
+    patch_completion(monkeypatch, "Перчатки:\n- Нитриловые (M/L)\n- Латексные (S/M/L)\n- Вини", "length")
+
+    answer, lang, truncated = main.generate_answer("Какие перчатки есть?", 350)
+
+    assert truncated
+    assert answer == "Перчатки:\n- Нитриловые (M/L)\n- Латексные (S/M/L) …"
+
+def test_complete_answer_is_not_marked(monkeypatch):
+    patch_completion(monkeypatch, "Да, есть.", "stop")
+
+    assert main.generate_answer("Есть перчатки?", 350) == ("Да, есть.", "ru", False)
+
+def test_short_answer_is_spoken_whole_without_tail():
+    spoken = main.make_spoken_summary("## Гарантии\n- **Лицензия** 2 категории", "ru")
+
+    assert spoken == "Гарантии. Лицензия 2 категории."
+
+def test_colon_is_not_a_sentence_boundary(monkeypatch):
+    monkeypatch.setattr(main, "SPOKEN_MAX_CHARS", 60)
+    answer = "Вот список: перчатки, маски, респираторы, бахилы, халаты, комбинезоны, антисептики"
+
+    spoken = main.make_spoken_summary(answer, "ru")
+
+    assert spoken.startswith("Вот список: перчатки, маски, респираторы")
+    assert spoken.endswith("… Подробности — в тексте ответа.")
+
+def test_early_sentence_end_falls_back_to_word_cut(monkeypatch):
+    monkeypatch.setattr(main, "SPOKEN_MAX_CHARS", 60)
+    answer = "Yes. We supply nitrile, latex and vinyl gloves in every size and in bulk quantities"
+
+    spoken = main.make_spoken_summary(answer, "en")
+
+    assert spoken.startswith("Yes. We supply nitrile, latex and vinyl gloves")
+    assert spoken.endswith("… See the full answer in the text.")
+
+def test_heading_with_unpunctuated_text_keeps_the_text(monkeypatch):
+    monkeypatch.setattr(main, "SPOKEN_MAX_CHARS", 60)
+    answer = "# СИЗ\nМаски респираторы перчатки бахилы халаты комбинезоны антисептики термометры"
+
+    spoken = main.make_spoken_summary(answer, "ru")
+
+    assert spoken.startswith("СИЗ. Маски респираторы перчатки")
+
+def test_long_answer_is_cut_at_a_late_sentence_end(monkeypatch):
+    monkeypatch.setattr(main, "SPOKEN_MAX_CHARS", 60)
+    answer = "We supply gloves, masks and respirators. Coveralls and gowns are also available."
+
+    spoken = main.make_spoken_summary(answer, "en")
+
+    assert spoken == "We supply gloves, masks and respirators. See the full answer in the text."
+
+def test_truncated_answer_without_late_boundary_is_cut_at_a_word():
+    tail = " ".join(["перчатки нитриловые латексные виниловые"] * 30)
+
+    answer = main.trim_truncated("Да. " + tail + " латек")
+
+    assert answer.startswith("Да. перчатки нитриловые")
+    assert answer.endswith("виниловые …")
+    assert len(answer) > len(tail) // 2
+
+def test_numbers_at_line_start_are_not_list_markers():
+    spoken = main.make_spoken_summary("1.500 ₸ за пару\n2.5 мм\n1. Нитриловые", "ru")
+
+    assert spoken == "1.500 ₸ за пару. 2.5 мм. Нитриловые."
+
+def test_markdown_is_stripped_before_punctuation_check():
+    spoken = main.make_spoken_summary("**Гарантии:**\n- Лицензия _2 категории_", "ru")
+
+    assert spoken == "Гарантии: Лицензия 2 категории."